@@ -0,0 +1,7 @@
+# Load the Celery app when Celery is installed so @shared_task works;
+# otherwise video processing falls back to in-process threading.
+try:
+    from .celery import app as celery_app
+    __all__ = ('celery_app',)
+except ImportError:
+    celery_app = None
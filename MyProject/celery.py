@@ -0,0 +1,17 @@
+"""
+Celery application for background video processing.
+
+Celery is optional: when it is not installed (or no broker is
+configured), video uploads fall back to in-process threading. See
+engagement/tasks.py for the task definitions.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'MyProject.settings')
+
+app = Celery('MyProject')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -138,6 +138,14 @@ MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
 
+# Sessions and flash messages
+# Messages ride in a signed cookie and sessions are only written when
+# they actually change, so CRUD views don't force a DB write per request.
+
+MESSAGE_STORAGE = 'django.contrib.messages.storage.cookie.CookieStorage'
+SESSION_SAVE_EVERY_REQUEST = False
+
+
 EMEMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
 EMAIL_PORT = 587
@@ -145,6 +153,36 @@ EMAIL_USE_TLS = True
 EMAIL_USE_SSL = False
 EMAIL_HOST_USER = 'mesadiq46@gmail.com'
 EMAIL_HOST_PASSWORD = 'iafndqpzcvttonwe'
+# File uploads
+# Never buffer uploads in memory - CCTV clips run to 500MB. The upload
+# view also swaps in TemporaryFileUploadHandler explicitly;
+# FileSystemStorage then moves the temp file into MEDIA_ROOT with a
+# rename instead of a chunk-by-chunk copy.
+
+FILE_UPLOAD_MAX_MEMORY_SIZE = 0
+
+
+# AI models (optional)
+# Paths to a YuNet face-detection ONNX model and a behavior-classifier
+# ONNX model. When unset or missing, the Haar cascade + heuristic
+# classifier in engagement/ai_engine.py are used instead.
+
+FACE_DETECTION_MODEL = os.environ.get('FACE_DETECTION_MODEL', '')
+BEHAVIOR_MODEL = os.environ.get('BEHAVIOR_MODEL', '')
+
+
+# Background processing (Celery)
+# Leave CELERY_BROKER_URL unset to process uploads in a background
+# thread inside the web process instead of on dedicated workers.
+
+# Size of the in-process video worker pool used when Celery is not
+# configured; 0 means one worker per CPU core.
+VIDEO_WORKERS = int(os.environ.get('VIDEO_WORKERS', '0'))
+
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', '')
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -1,10 +1,19 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Avg, Max, Min, Count
+from django.db.models import Avg, Max, Min, Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
 from django.utils import timezone
 from datetime import timedelta
 from engagement.models import VideoUpload, EngagementRecord
+from engagement.signals import engagement_record_count, get_engagement_version
+
+# Cache TTLs for the computed view contexts. Keys include the engagement
+# data version (bumped on every new EngagementRecord), so fresh AI output
+# invalidates cached pages immediately; the TTL is just a backstop.
+DASHBOARD_CACHE_TTL = 60
+ANALYTICS_CACHE_TTL = 300
 
 
 @login_required
@@ -12,16 +21,22 @@ def dashboard(request):
     """
     Main dashboard showing overview of AI-generated engagement data
     """
-    # Get latest video and its records
-    latest_video = VideoUpload.objects.filter(processed=True).first()
-    
-    # Get latest session data
-    latest_records = EngagementRecord.objects.all().order_by('-timestamp')[:100]
-    
-    # Calculate aggregate statistics
-    total_records = EngagementRecord.objects.count()
-    
-    # Get totals across all records
+    # Serve the whole context from cache when the data hasn't changed
+    cache_key = 'analytics:dashboard:u%s:v%s' % (
+        request.user.pk, get_engagement_version()
+    )
+    context = cache.get(cache_key)
+    if context is not None:
+        return render(request, 'analytics/dashboard.html', context)
+
+    # Get latest video and its records - explicit order_by + only() so
+    # the (processed, -uploaded_at) index serves one narrow row
+    latest_video = VideoUpload.objects.filter(processed=True).only(
+        'id', 'title', 'uploaded_at'
+    ).order_by('-uploaded_at').first()
+
+    # Get totals across all records - single aggregate so the table
+    # is scanned once instead of once per metric
     totals = EngagementRecord.objects.aggregate(
         total_students=Sum('total_students'),
         total_attentive=Sum('attentive_count'),
@@ -32,6 +47,9 @@ def dashboard(request):
         max_engagement=Max('engagement_percentage'),
         min_engagement=Min('engagement_percentage'),
     )
+
+    # Record count comes from the signal-maintained cache counter
+    total_records = engagement_record_count()
     
     # Calculate current session stats (latest video)
     if latest_video:
@@ -48,43 +66,52 @@ def dashboard(request):
             'total_detections': 0,
         }
     
-    # Behavior distribution
+    # Behavior distribution (reuse the totals computed above)
     behavior_counts = {
-        'Attentive': EngagementRecord.objects.aggregate(
-            total=Sum('attentive_count')
-        )['total'] or 0,
-        'Sleepy': EngagementRecord.objects.aggregate(
-            total=Sum('sleepy_count')
-        )['total'] or 0,
-        'Distracted': EngagementRecord.objects.aggregate(
-            total=Sum('distracted_count')
-        )['total'] or 0,
-        'Neutral': EngagementRecord.objects.aggregate(
-            total=Sum('neutral_count')
-        )['total'] or 0,
+        'Attentive': totals['total_attentive'] or 0,
+        'Sleepy': totals['total_sleepy'] or 0,
+        'Distracted': totals['total_distracted'] or 0,
+        'Neutral': totals['total_neutral'] or 0,
     }
     
-    # Recent records
+    # Recent records - fetch only the columns the table renders
     recent_records = EngagementRecord.objects.select_related(
         'video_upload'
+    ).only(
+        'timestamp', 'total_students', 'attentive_count', 'sleepy_count',
+        'distracted_count', 'neutral_count', 'engagement_percentage',
+        'video_upload__title'
     ).order_by('-timestamp')[:10]
     
-    # Daily averages for last 7 days
+    # Daily averages for last 7 days - one GROUP BY query instead of
+    # separate exists/aggregate/count queries per day
+    since = timezone.now().date() - timedelta(days=6)
+    daily_rows = {
+        row['day']: row
+        for row in EngagementRecord.objects.filter(timestamp__date__gte=since)
+        .annotate(day=TruncDate('timestamp'))
+        .values('day')
+        .annotate(
+            avg_engagement=Avg('engagement_percentage'),
+            record_count=Count('id'),
+        )
+    }
+
     daily_data = []
     for i in range(7):
         date = timezone.now().date() - timedelta(days=i)
-        day_records = EngagementRecord.objects.filter(timestamp__date=date)
-        if day_records.exists():
-            avg = day_records.aggregate(avg=Avg('engagement_percentage'))['avg']
-            daily_data.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'label': date.strftime('%b %d'),
-                'avg_engagement': round(avg, 2) if avg else 0,
-                'record_count': day_records.count()
-            })
+        row = daily_rows.get(date)
+        daily_data.append({
+            'date': date.strftime('%Y-%m-%d'),
+            'label': date.strftime('%b %d'),
+            'avg_engagement': round(row['avg_engagement'], 2) if row and row['avg_engagement'] else 0,
+            'record_count': row['record_count'] if row else 0
+        })
     
     # Get videos for dropdown
-    videos = VideoUpload.objects.all()[:5]
+    videos = VideoUpload.objects.only(
+        'id', 'title', 'uploaded_at'
+    ).order_by('-uploaded_at')[:5]
     
     context = {
         'total_records': total_records,
@@ -96,7 +123,8 @@ def dashboard(request):
         'daily_data': daily_data,
         'videos': videos,
     }
-    
+
+    cache.set(cache_key, context, DASHBOARD_CACHE_TTL)
     return render(request, 'analytics/dashboard.html', context)
 
 
@@ -109,9 +137,22 @@ def analytics(request):
     video_id = request.GET.get('video')
     date_from = request.GET.get('date_from')
     date_to = request.GET.get('date_to')
-    
-    # Base queryset
-    records = EngagementRecord.objects.select_related('video_upload')
+
+    # Filters are part of the cache key, so each filter combination is
+    # cached independently and invalidated together on new records
+    cache_key = 'analytics:analytics:%s:%s:%s:v%s' % (
+        video_id, date_from, date_to, get_engagement_version()
+    )
+    cached_context = cache.get(cache_key)
+    if cached_context is not None:
+        return render(request, 'analytics/analytics.html', cached_context)
+
+    # Base queryset - only the columns consumed by the stats and charts
+    records = EngagementRecord.objects.select_related('video_upload').only(
+        'timestamp', 'total_students', 'attentive_count', 'sleepy_count',
+        'distracted_count', 'neutral_count', 'engagement_percentage',
+        'video_upload__title'
+    )
     
     # Apply filters
     if video_id:
@@ -123,39 +164,38 @@ def analytics(request):
     if date_to:
         records = records.filter(timestamp__date__lte=date_to)
     
-    # Calculate statistics
-    total_records = records.count()
-    
+    # Calculate statistics, behavior totals and record count in one
+    # aggregate so the filtered table is scanned a single time
     stats = records.aggregate(
+        total_records=Count('id'),
         avg_engagement=Avg('engagement_percentage'),
         max_engagement=Max('engagement_percentage'),
         min_engagement=Min('engagement_percentage'),
         avg_students=Avg('total_students'),
         max_students=Max('total_students'),
+        total_attentive=Coalesce(Sum('attentive_count'), 0),
+        total_sleepy=Coalesce(Sum('sleepy_count'), 0),
+        total_distracted=Coalesce(Sum('distracted_count'), 0),
+        total_neutral=Coalesce(Sum('neutral_count'), 0),
     )
-    
+    total_records = stats['total_records']
+
     # Behavior totals
-    behavior_totals = records.aggregate(
-        total_attentive=Sum('attentive_count'),
-        total_sleepy=Sum('sleepy_count'),
-        total_distracted=Sum('distracted_count'),
-        total_neutral=Sum('neutral_count'),
-    )
-    
-    total_behaviors = (
-        (behavior_totals['total_attentive'] or 0) +
-        (behavior_totals['total_sleepy'] or 0) +
-        (behavior_totals['total_distracted'] or 0) +
-        (behavior_totals['total_neutral'] or 0)
-    )
-    
+    behavior_totals = {
+        key: stats[key]
+        for key in ('total_attentive', 'total_sleepy',
+                    'total_distracted', 'total_neutral')
+    }
+
+    total_behaviors = sum(behavior_totals.values())
+
     # Calculate percentages
     if total_behaviors > 0:
         behavior_percentages = {
-            'Attentive': round((behavior_totals['total_attentive'] or 0) / total_behaviors * 100, 1),
-            'Sleepy': round((behavior_totals['total_sleepy'] or 0) / total_behaviors * 100, 1),
-            'Distracted': round((behavior_totals['total_distracted'] or 0) / total_behaviors * 100, 1),
-            'Neutral': round((behavior_totals['total_neutral'] or 0) / total_behaviors * 100, 1),
+            'Attentive': round(stats['total_attentive'] / total_behaviors * 100, 1),
+            'Sleepy': round(stats['total_sleepy'] / total_behaviors * 100, 1),
+            'Distracted': round(stats['total_distracted'] / total_behaviors * 100, 1),
+            'Neutral': round(stats['total_neutral'] / total_behaviors * 100, 1),
         }
     else:
         behavior_percentages = {
@@ -166,22 +206,29 @@ def analytics(request):
         }
     
     # Get data for charts
-    # Time series data
-    time_series = []
-    for record in records.order_by('timestamp')[:100]:
-        time_series.append({
-            'timestamp': record.timestamp.strftime('%Y-%m-%d %H:%M:%S'),
-            'engagement': record.engagement_percentage,
-            'total_students': record.total_students,
-            'attentive': record.attentive_count,
-            'sleepy': record.sleepy_count,
-            'distracted': record.distracted_count,
-            'neutral': record.neutral_count,
-        })
+    # Time series data - .values() skips model construction and
+    # .iterator() avoids populating a result cache we never reuse
+    time_series = [
+        {
+            'timestamp': row['timestamp'].strftime('%Y-%m-%d %H:%M:%S'),
+            'engagement': row['engagement_percentage'],
+            'total_students': row['total_students'],
+            'attentive': row['attentive_count'],
+            'sleepy': row['sleepy_count'],
+            'distracted': row['distracted_count'],
+            'neutral': row['neutral_count'],
+        }
+        for row in records.order_by('timestamp').values(
+            'timestamp', 'engagement_percentage', 'total_students',
+            'attentive_count', 'sleepy_count', 'distracted_count',
+            'neutral_count'
+        )[:100].iterator(chunk_size=100)
+    ]
     
-    # Daily averages
-    daily_averages = records.extra(
-        select={'day': 'date(timestamp)'}
+    # Daily averages - TruncDate instead of .extra(), which is pending
+    # deprecation and uses SQLite-only date() syntax
+    daily_averages = records.annotate(
+        day=TruncDate('timestamp')
     ).values('day').annotate(
         avg_engagement=Avg('engagement_percentage'),
         avg_students=Avg('total_students'),
@@ -203,10 +250,7 @@ def analytics(request):
         'date_from': date_from,
         'date_to': date_to,
     }
-    
-    return render(request, 'analytics/analytics.html', context)
 
-
-# Import Sum if not already imported
-from django.db.models import Sum
+    cache.set(cache_key, context, ANALYTICS_CACHE_TTL)
+    return render(request, 'analytics/analytics.html', context)
 
@@ -5,3 +5,7 @@ class EngagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'engagement'
 
+    def ready(self):
+        # Register cache-invalidation signal handlers
+        from . import signals  # noqa: F401
+
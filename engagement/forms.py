@@ -1,6 +1,11 @@
+import os
+
 from django import forms
 from .models import VideoUpload, EngagementRecord
 
+_ALLOWED_EXTS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv'})
+_MAX_VIDEO_SIZE = 500 * 1024 * 1024  # 500MB
+
 
 class VideoUploadForm(forms.ModelForm):
     """
@@ -23,22 +28,20 @@ class VideoUploadForm(forms.ModelForm):
     def clean_video_file(self):
         video_file = self.cleaned_data.get('video_file')
         if video_file:
-            # Validate file extension
-            allowed_extensions = ['mp4', 'avi', 'mov', 'mkv', 'flv', 'wmv']
-            ext = video_file.name.split('.')[-1].lower()
-            
-            if ext not in allowed_extensions:
+            # Validate file size first (max 500MB) - cheapest check
+            if video_file.size > _MAX_VIDEO_SIZE:
                 raise forms.ValidationError(
-                    f'Unsupported file format. Allowed formats: {", ".join(allowed_extensions)}'
+                    'Video file is too large. Maximum size is 500MB.'
                 )
-            
-            # Validate file size (max 500MB)
-            max_size = 500 * 1024 * 1024  # 500MB
-            if video_file.size > max_size:
+
+            # Validate file extension
+            ext = os.path.splitext(video_file.name)[1].lower()
+            if ext not in _ALLOWED_EXTS:
                 raise forms.ValidationError(
-                    f'Video file is too large. Maximum size is 500MB.'
+                    'Unsupported file format. Allowed formats: '
+                    + ', '.join(sorted(e.lstrip('.') for e in _ALLOWED_EXTS))
                 )
-        
+
         return video_file
 
 
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0002_videoupload_remove_engagementrecord_attention_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='engagementrecord',
+            index=models.Index(fields=['-timestamp'], name='engagement__timesta_705648_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='engagementrecord',
+            index=models.Index(fields=['video_upload', '-timestamp'], name='engagement__video_u_96cca1_idx'),
+        ),
+    ]
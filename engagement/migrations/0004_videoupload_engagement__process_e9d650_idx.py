@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0003_engagementrecord_engagement__timesta_705648_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='videoupload',
+            index=models.Index(fields=['processed', '-uploaded_at'], name='engagement__process_e9d650_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0004_videoupload_engagement__process_e9d650_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='engagementrecord',
+            index=models.Index(fields=['engagement_percentage'], name='engagement__engagem_22ea66_idx'),
+        ),
+    ]
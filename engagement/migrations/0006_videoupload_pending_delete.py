@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0005_engagementrecord_engagement__engagem_22ea66_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoupload',
+            name='pending_delete',
+            field=models.BooleanField(default=False),
+        ),
+    ]
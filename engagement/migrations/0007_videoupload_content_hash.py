@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0006_videoupload_pending_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videoupload',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
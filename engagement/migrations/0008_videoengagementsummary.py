@@ -0,0 +1,28 @@
+# Generated by Django 5.2.17 on 2026-08-27 11:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('engagement', '0007_videoupload_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VideoEngagementSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('avg_engagement', models.FloatField(default=0.0)),
+                ('peak_engagement', models.FloatField(default=0.0)),
+                ('attentive_total', models.IntegerField(default=0)),
+                ('sleepy_total', models.IntegerField(default=0)),
+                ('distracted_total', models.IntegerField(default=0)),
+                ('neutral_total', models.IntegerField(default=0)),
+                ('records_count', models.IntegerField(default=0)),
+                ('video_upload', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='summary', to='engagement.videoupload')),
+            ],
+        ),
+    ]
@@ -4,10 +4,21 @@ from django.utils import timezone
 
 
 def video_upload_path(instance, filename):
-    """Generate upload path for video files"""
-    ext = filename.split('.')[-1]
-    filename = f"{instance.uploaded_at.strftime('%Y%m%d_%H%M%S')}.{ext}"
-    return os.path.join('videos/', filename)
+    """
+    Content-addressable upload path: videos/<hash[:2]>/<hash><ext>.
+
+    Naming files by content hash means a clip uploaded twice lands on
+    the same object and can be deduplicated before any processing runs.
+    """
+    ext = os.path.splitext(filename)[1].lower()
+    if instance.content_hash:
+        return os.path.join(
+            'videos', instance.content_hash[:2],
+            f'{instance.content_hash}{ext}'
+        )
+    # Fallback for saves that bypass the upload view (e.g. the admin)
+    stamp = timezone.now().strftime('%Y%m%d_%H%M%S')
+    return os.path.join('videos', f'{stamp}{ext}')
 
 
 class VideoUpload(models.Model):
@@ -30,10 +41,21 @@ class VideoUpload(models.Model):
     )
     duration_seconds = models.FloatField(null=True, blank=True)
     total_frames = models.IntegerField(null=True, blank=True)
-    
+    # Set when a delete has been requested; the row and file are purged
+    # by a background worker so the request never waits on disk I/O
+    pending_delete = models.BooleanField(default=False)
+    # SHA-256 of the file contents, used to dedupe re-uploads
+    content_hash = models.CharField(
+        max_length=64, db_index=True, null=True, blank=True
+    )
+
     class Meta:
         ordering = ['-uploaded_at']
-    
+        indexes = [
+            # Serves the "latest processed video" dashboard lookup
+            models.Index(fields=['processed', '-uploaded_at']),
+        ]
+
     def __str__(self):
         return f"Video {self.id} - {self.uploaded_at.strftime('%Y-%m-%d %H:%M')}"
 
@@ -72,18 +94,62 @@ class EngagementRecord(models.Model):
     # Frame information
     frame_number = models.IntegerField(null=True, blank=True)
     processing_time = models.FloatField(null=True, blank=True, help_text="Time taken to process this frame in seconds")
-    
+
     class Meta:
         ordering = ['-timestamp']
+        indexes = [
+            # Serves order_by('-timestamp') listings and date range filters
+            models.Index(fields=['-timestamp']),
+            # Serves per-video record queries ordered by time
+            models.Index(fields=['video_upload', '-timestamp']),
+            # Serves the high/medium/low engagement range filters
+            models.Index(fields=['engagement_percentage']),
+        ]
     
     def __str__(self):
         return f"Engagement {self.id} - {self.engagement_percentage:.1f}% at {self.timestamp}"
     
+    @classmethod
+    def compute_percentage(cls, attentive, total):
+        """Engagement percentage for a given attentive/total count"""
+        return (attentive / total) * 100 if total > 0 else 0.0
+
     def save(self, *args, **kwargs):
-        """Calculate engagement percentage automatically"""
-        if self.total_students > 0:
-            self.engagement_percentage = (self.attentive_count / self.total_students) * 100
-        else:
-            self.engagement_percentage = 0.0
+        """
+        Calculate engagement percentage on first save.
+
+        Updates (e.g. setting processing_time) keep the stored value;
+        the bulk ingestion path precomputes the percentage and bypasses
+        save() entirely via bulk_create.
+        """
+        if self.pk is None:
+            self.engagement_percentage = self.compute_percentage(
+                self.attentive_count, self.total_students
+            )
         super().save(*args, **kwargs)
 
+
+class VideoEngagementSummary(models.Model):
+    """
+    Denormalized per-video engagement aggregates.
+
+    Written once when processing finishes, so detail and analytics
+    pages read one indexed row instead of re-aggregating the video's
+    engagement records on every render.
+    """
+    video_upload = models.OneToOneField(
+        VideoUpload,
+        on_delete=models.CASCADE,
+        related_name='summary'
+    )
+    avg_engagement = models.FloatField(default=0.0)
+    peak_engagement = models.FloatField(default=0.0)
+    attentive_total = models.IntegerField(default=0)
+    sleepy_total = models.IntegerField(default=0)
+    distracted_total = models.IntegerField(default=0)
+    neutral_total = models.IntegerField(default=0)
+    records_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Summary for video {self.video_upload_id}"
+
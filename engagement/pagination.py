@@ -0,0 +1,56 @@
+"""
+Keyset ("cursor") pagination helper for the hot list views.
+
+Django's Paginator issues a SELECT COUNT(*) on every page request and
+OFFSET scans grow linearly with page depth. Keyset pagination issues no
+count and every page is an index seek: the cursor is the ordering-field
+value of the last row on the previous page.
+"""
+
+from django.core.exceptions import ValidationError
+
+
+def paginate_keyset(queryset, before=None, limit=20, field='timestamp'):
+    """
+    Paginate a queryset ordered newest-first by `field`.
+
+    Args:
+        queryset: Base queryset (any filters already applied)
+        before: Cursor from the previous page (the last row's field
+            value, as passed back via the ?before= query parameter)
+        limit: Page size
+        field: Ordering/cursor field name
+
+    Returns:
+        (rows, next_cursor): The page of rows and the cursor for the
+        next page, or None when this is the last page.
+    """
+    if before:
+        try:
+            queryset = queryset.filter(**{f'{field}__lt': before})
+        except (ValidationError, ValueError, TypeError):
+            # Malformed cursor - serve the first page
+            pass
+
+    rows = list(queryset.order_by(f'-{field}', '-pk')[:limit + 1])
+
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    next_cursor = getattr(rows[-1], field)
+    if hasattr(next_cursor, 'isoformat'):
+        next_cursor = next_cursor.isoformat()
+    return rows, next_cursor
+
+
+def next_page_url(request, next_cursor):
+    """
+    Build the ?before= link for the next page, preserving the other
+    query parameters (filters) of the current request.
+    """
+    if next_cursor is None:
+        return None
+    params = request.GET.copy()
+    params['before'] = next_cursor
+    return '?' + params.urlencode()
@@ -0,0 +1,96 @@
+"""
+Cache invalidation signals for AI-generated engagement data.
+
+EngagementRecords are append-only (written by the background video
+processor), so cached analytics pages stay valid until a record is
+created or deleted. Instead of deleting every cached page, we bump a
+version number that views mix into their cache keys - old entries
+simply expire.
+"""
+
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import EngagementRecord, VideoUpload
+
+ENGAGEMENT_VERSION_KEY = 'engagement_version'
+ENGAGEMENT_COUNT_KEY = 'engagement_record_count'
+VIDEO_DROPDOWN_KEY = 'video_dropdown_v1'
+
+
+def video_dropdown():
+    """
+    Videos for the engagement_list filter dropdown, served from cache.
+
+    Only the columns the template renders are fetched; the entry is
+    dropped whenever a VideoUpload is saved or deleted.
+    """
+    return cache.get_or_set(
+        VIDEO_DROPDOWN_KEY,
+        lambda: list(
+            VideoUpload.objects.filter(pending_delete=False)
+            .only('id', 'title', 'uploaded_at')
+        ),
+        300,
+    )
+
+
+@receiver(post_save, sender=VideoUpload)
+@receiver(post_delete, sender=VideoUpload)
+def video_upload_changed(sender, instance, **kwargs):
+    cache.delete(VIDEO_DROPDOWN_KEY)
+
+
+def get_engagement_version():
+    """Current version of the engagement data, for use in cache keys"""
+    return cache.get(ENGAGEMENT_VERSION_KEY, 0)
+
+
+def bump_engagement_version():
+    """
+    Mark the engagement data as changed.
+
+    Called from the signal handlers below and directly by bulk ingestion
+    paths (bulk_create does not fire post_save).
+    """
+    try:
+        cache.incr(ENGAGEMENT_VERSION_KEY)
+    except ValueError:
+        cache.set(ENGAGEMENT_VERSION_KEY, 1, None)
+
+
+def engagement_record_count():
+    """
+    Total number of EngagementRecords, served from cache.
+
+    The table is append-mostly, so the counter is kept current by the
+    signal handlers below (and by the bulk ingestion path) instead of
+    issuing a COUNT(*) scan per page load; the TTL is a backstop.
+    """
+    return cache.get_or_set(
+        ENGAGEMENT_COUNT_KEY,
+        lambda: EngagementRecord.objects.count(),
+        300,
+    )
+
+
+def adjust_engagement_record_count(delta):
+    """Adjust the cached record count; a cache miss self-heals on read"""
+    try:
+        cache.incr(ENGAGEMENT_COUNT_KEY, delta)
+    except ValueError:
+        pass
+
+
+@receiver(post_save, sender=EngagementRecord)
+def engagement_record_saved(sender, instance, created, **kwargs):
+    bump_engagement_version()
+    if created:
+        adjust_engagement_record_count(1)
+
+
+@receiver(post_delete, sender=EngagementRecord)
+def engagement_record_deleted(sender, instance, **kwargs):
+    bump_engagement_version()
+    adjust_engagement_record_count(-1)
@@ -0,0 +1,92 @@
+"""
+Background tasks for video processing.
+
+When Celery is installed and CELERY_BROKER_URL is configured, uploads
+are dispatched to dedicated workers so a multi-minute OpenCV loop never
+blocks a web worker. Without Celery the upload view falls back to the
+in-process thread it used before.
+"""
+
+import atexit
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# Persistent bounded worker pool for the non-Celery path. A fixed pool
+# keeps concurrent decode jobs at a predictable level (extra uploads
+# queue inside the executor) instead of spawning one unbounded thread
+# per upload.
+_VIDEO_POOL = None
+
+
+def _get_video_pool():
+    """Lazily create the shared video-processing thread pool"""
+    global _VIDEO_POOL
+
+    if _VIDEO_POOL is None:
+        from django.conf import settings
+        workers = getattr(settings, 'VIDEO_WORKERS', 0) or os.cpu_count() or 1
+        _VIDEO_POOL = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix='video-worker'
+        )
+        atexit.register(_VIDEO_POOL.shutdown, wait=False)
+
+    return _VIDEO_POOL
+
+try:
+    from celery import shared_task
+    CELERY_AVAILABLE = True
+except ImportError:
+    CELERY_AVAILABLE = False
+
+
+def _run_processing(video_upload_id, video_path):
+    """Shared body for the Celery task and the threading fallback"""
+    from .views import process_video_async
+    process_video_async(video_upload_id, video_path)
+
+
+if CELERY_AVAILABLE:
+    @shared_task(bind=True, ignore_result=True)
+    def process_video_task(self, video_upload_id, video_path):
+        """Process an uploaded video on a Celery worker"""
+        _run_processing(video_upload_id, video_path)
+else:
+    process_video_task = None
+
+
+def _purge_video(video_upload_id, file_name):
+    """Delete a video's file and row, off the request path"""
+    from django.core.files.storage import default_storage
+    from .models import VideoUpload
+
+    try:
+        if file_name:
+            default_storage.delete(file_name)
+        VideoUpload.objects.filter(pk=video_upload_id).delete()
+    except Exception as e:
+        logger.error(f"Error purging video {video_upload_id}: {e}")
+
+
+def dispatch_video_purge(video_upload_id, file_name):
+    """Queue deletion of a video's file and row on the worker pool"""
+    _get_video_pool().submit(_purge_video, video_upload_id, file_name)
+
+
+def dispatch_video_processing(video_upload_id, video_path):
+    """
+    Queue a video for background processing.
+
+    Prefers Celery (dedicated workers, parallel uploads); falls back to
+    the in-process worker pool when no broker is available.
+    """
+    from django.conf import settings
+
+    if CELERY_AVAILABLE and getattr(settings, 'CELERY_BROKER_URL', None):
+        process_video_task.delay(video_upload_id, video_path)
+        return
+
+    _get_video_pool().submit(_run_processing, video_upload_id, video_path)
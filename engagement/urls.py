@@ -10,6 +10,7 @@ urlpatterns = [
     path('videos/<int:pk>/', views.video_detail, name='video_detail'),
     path('videos/<int:pk>/delete/', views.video_delete, name='video_delete'),
     path('videos/<int:video_id>/status/', views.get_processing_status, name='video_status'),
+    path('videos/<int:pk>/stream/', views.video_stream, name='video_stream'),
     
     # Engagement record URLs
     path('', views.engagement_list, name='engagement_list'),
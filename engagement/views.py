@@ -1,14 +1,24 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import JsonResponse
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.conf import settings
+from django.http import (
+    FileResponse, Http404, HttpResponse, HttpResponseNotModified, JsonResponse
+)
+from django.views.decorators.csrf import csrf_exempt, csrf_protect
 from django.views.decorators.http import require_http_methods
-from .models import VideoUpload, EngagementRecord
+from django.urls import reverse
+from .models import VideoUpload, EngagementRecord, VideoEngagementSummary
 from .forms import VideoUploadForm
-from .ai_engine import process_video, simulate_processing
-import threading
+from .ai_engine import CV2_AVAILABLE, process_video, probe_video, simulate_processing
+from .pagination import paginate_keyset, next_page_url
+from .signals import video_dropdown
+import hashlib
 import logging
+import mimetypes
 
 logger = logging.getLogger(__name__)
 
@@ -20,41 +30,54 @@ def process_video_async(video_upload_id, video_path):
     from engagement.models import VideoUpload
     
     try:
-        # Update status to processing
-        video_upload = VideoUpload.objects.get(id=video_upload_id)
-        video_upload.processing_status = 'processing'
-        video_upload.save()
-        
-        # Try to process with OpenCV
-        try:
-            import cv2
+        # Claim the row atomically before doing any work, so a duplicate
+        # dispatch (user retry, redelivered task) exits immediately
+        # instead of redecoding the whole file. On backends with row
+        # locks a concurrent claimer skips or waits rather than racing.
+        with transaction.atomic():
+            pending = VideoUpload.objects.filter(
+                id=video_upload_id, processing_status='pending'
+            ).only('id')
+            if connection.features.has_select_for_update:
+                pending = pending.select_for_update(
+                    skip_locked=connection.features.has_select_for_update_skip_locked
+                )
+            if pending.first() is None:
+                logger.info(
+                    f"Video {video_upload_id} already claimed, skipping"
+                )
+                return
+            VideoUpload.objects.filter(id=video_upload_id).update(
+                processing_status='processing'
+            )
+
+        # Process with OpenCV when available; ai_engine already probed
+        # the import at module load, so no per-task import attempt
+        if CV2_AVAILABLE:
             result = process_video(video_path, video_upload_id, save_interval=30)
-        except ImportError:
+        else:
             # Fall back to simulation if OpenCV not available
             logger.warning("OpenCV not available, using simulated processing")
             result = simulate_processing(video_upload_id)
-        
-        # Update video upload status
-        video_upload = VideoUpload.objects.get(id=video_upload_id)
-        
-        if result.get('success'):
-            video_upload.processed = True
-            video_upload.processing_status = 'completed'
-            if 'total_frames' in result:
-                video_upload.total_frames = result['total_frames']
-            if 'processing_time' in result:
-                video_upload.duration_seconds = result['processing_time']
-        else:
-            video_upload.processing_status = 'failed'
-        
-        video_upload.save()
-        
+
+        # Record the final status in a single UPDATE - no refetch needed
+        updates = {
+            'processing_status': 'completed' if result.get('success') else 'failed',
+            'processed': result.get('success', False),
+        }
+        if 'total_frames' in result:
+            updates['total_frames'] = result['total_frames']
+        if 'processing_time' in result:
+            updates['duration_seconds'] = result['processing_time']
+
+        VideoUpload.objects.filter(id=video_upload_id).update(**updates)
+
     except Exception as e:
         logger.error(f"Error processing video: {e}")
         try:
-            video_upload = VideoUpload.objects.get(id=video_upload_id)
-            video_upload.processing_status = 'failed'
-            video_upload.save()
+            VideoUpload.objects.filter(id=video_upload_id).update(
+                processing_status='failed'
+            )
         except:
             pass
 
@@ -64,8 +87,12 @@ def engagement_list(request):
     """
     List all engagement records with pagination and filters
     """
-    records = EngagementRecord.objects.all().select_related('video_upload')
-    
+    records = EngagementRecord.objects.select_related('video_upload').only(
+        'timestamp', 'total_students', 'attentive_count', 'sleepy_count',
+        'distracted_count', 'neutral_count', 'engagement_percentage',
+        'video_upload__title'
+    )
+
     # Filter by video
     video_id = request.GET.get('video')
     if video_id:
@@ -86,16 +113,17 @@ def engagement_list(request):
         elif engagement_filter == 'low':
             records = records.filter(engagement_percentage__lt=40)
     
-    paginator = Paginator(records, 20)
-    page_number = request.GET.get('page')
-    records = paginator.get_page(page_number)
-    
-    # Get videos for filter dropdown
-    videos = VideoUpload.objects.all()
-    
+    records, next_cursor = paginate_keyset(
+        records, before=request.GET.get('before'), limit=20
+    )
+
+    # Get videos for filter dropdown (cached, invalidated on save/delete)
+    videos = video_dropdown()
+
     return render(request, 'engagement/engagement_list.html', {
         'records': records,
-        'videos': videos
+        'videos': videos,
+        'next_page_url': next_page_url(request, next_cursor)
     })
 
 
@@ -125,23 +153,66 @@ def engagement_delete(request, pk):
 
 
 @login_required
+@csrf_exempt
 def upload_video(request):
     """
-    Handle video upload and trigger AI processing
+    Handle video upload and trigger AI processing.
+
+    Uploads are spooled straight to disk: the default handler chain
+    buffers files under FILE_UPLOAD_MAX_MEMORY_SIZE in RAM, which is
+    hostile to 500MB CCTV clips. The handler must be swapped before
+    request.POST is touched, hence the csrf_exempt here and csrf_protect
+    on the inner view (the CSRF middleware would otherwise consume the
+    body first).
     """
+    request.upload_handlers = [TemporaryFileUploadHandler(request)]
+    return _upload_video(request)
+
+
+def _hash_uploaded_file(uploaded_file):
+    """Stream-hash an uploaded file with SHA-256 (1 MiB reads)"""
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks(1024 * 1024):
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+@csrf_protect
+def _upload_video(request):
     if request.method == 'POST':
         form = VideoUploadForm(request.POST, request.FILES)
         if form.is_valid():
-            video_upload = form.save()
-            
-            # Start async processing
+            content_hash = _hash_uploaded_file(request.FILES['video_file'])
+
+            # Same bytes already on disk? Reuse the existing video and
+            # its records instead of storing and decoding a second copy
+            existing = VideoUpload.objects.filter(
+                content_hash=content_hash, pending_delete=False
+            ).first()
+            if existing is not None:
+                messages.info(
+                    request,
+                    "This video was already uploaded - showing the existing analysis."
+                )
+                return redirect('engagement:video_detail', pk=existing.pk)
+
+            video_upload = form.save(commit=False)
+            video_upload.content_hash = content_hash
+            video_upload.save()
             video_path = video_upload.video_file.path
-            thread = threading.Thread(
-                target=process_video_async,
-                args=(video_upload.id, video_path)
-            )
-            thread.start()
-            
+
+            # Read frame count / duration from the container header so
+            # the dashboard has metadata before the decode finishes
+            meta = probe_video(video_path)
+            if meta:
+                VideoUpload.objects.filter(id=video_upload.id).update(**meta)
+
+            # Start async processing (Celery worker if configured,
+            # otherwise a background thread)
+            from .tasks import dispatch_video_processing
+            dispatch_video_processing(video_upload.id, video_path)
+
             messages.success(
                 request, 
                 "Video uploaded successfully! Processing has started in the background."
@@ -158,12 +229,17 @@ def video_list(request):
     """
     List all uploaded videos with their processing status
     """
-    videos = VideoUpload.objects.all()
-    paginator = Paginator(videos, 10)
-    page_number = request.GET.get('page')
-    videos = paginator.get_page(page_number)
-    
-    return render(request, 'engagement/video_list.html', {'videos': videos})
+    videos, next_cursor = paginate_keyset(
+        VideoUpload.objects.filter(pending_delete=False),
+        before=request.GET.get('before'),
+        limit=10,
+        field='uploaded_at'
+    )
+
+    return render(request, 'engagement/video_list.html', {
+        'videos': videos,
+        'next_page_url': next_page_url(request, next_cursor)
+    })
 
 
 @login_required
@@ -172,11 +248,31 @@ def video_detail(request, pk):
     View details of a specific video upload
     """
     video = get_object_or_404(VideoUpload, pk=pk)
-    records = EngagementRecord.objects.filter(video_upload=video).order_by('timestamp')
-    
+    records = EngagementRecord.objects.filter(video_upload=video)
+
+    # Long videos produce far too many records to render on one page -
+    # send those to the paginated list instead of materializing them all
+    if records.count() > 500:
+        return redirect(reverse('engagement:engagement_list') + f'?video={pk}')
+
+    records = list(
+        records.only(
+            'timestamp', 'engagement_percentage', 'total_students',
+            'attentive_count', 'sleepy_count', 'distracted_count',
+            'neutral_count', 'frame_number'
+        ).order_by('timestamp').iterator(chunk_size=2000)
+    )
+
+    # One-row denormalized aggregates, written when processing finished
+    try:
+        summary = video.summary
+    except VideoEngagementSummary.DoesNotExist:
+        summary = None
+
     return render(request, 'engagement/video_detail.html', {
         'video': video,
-        'records': records
+        'records': records,
+        'summary': summary
     })
 
 
@@ -187,24 +283,87 @@ def video_delete(request, pk):
     Delete a video upload and its associated records
     """
     video = get_object_or_404(VideoUpload, pk=pk)
-    video.video_file.delete()
-    video.delete()
+
+    # Unlinking a 500MB file (or a remote-storage round trip) does not
+    # belong on the request path - mark the row and purge in background
+    video.pending_delete = True
+    video.save(update_fields=['pending_delete'])
+
+    from .tasks import dispatch_video_purge
+    dispatch_video_purge(video.pk, video.video_file.name)
+
     return JsonResponse({'success': True})
 
 
+# A video in a terminal state never changes status again, so its poll
+# response can sit in cache until the row is deleted
+STATUS_CACHE_TTL = 3600
+
+
 @login_required
 def get_processing_status(request, video_id):
     """
-    AJAX endpoint to check video processing status
+    AJAX endpoint to check video processing status.
+
+    Polled every few seconds per active upload, so this path is kept
+    cheap: only the four returned columns are fetched, terminal
+    (completed/failed) responses are cached, and identical polls
+    short-circuit with a 304 via ETag.
     """
-    video = get_object_or_404(VideoUpload, pk=video_id)
-    
-    return JsonResponse({
-        'status': video.processing_status,
-        'processed': video.processed,
-        'total_frames': video.total_frames,
-        'duration_seconds': video.duration_seconds
+    cache_key = f'video_status:{video_id}'
+    data = cache.get(cache_key)
+
+    if data is None:
+        data = VideoUpload.objects.filter(pk=video_id).values(
+            'processing_status', 'processed', 'total_frames', 'duration_seconds'
+        ).first()
+        if data is None:
+            raise Http404("Video not found")
+        if data['processing_status'] in ('completed', 'failed'):
+            cache.set(cache_key, data, STATUS_CACHE_TTL)
+
+    etag = '"%s-%s"' % (data['processing_status'], data['total_frames'])
+    if request.headers.get('If-None-Match') == etag:
+        return HttpResponseNotModified()
+
+    response = JsonResponse({
+        'status': data['processing_status'],
+        'processed': data['processed'],
+        'total_frames': data['total_frames'],
+        'duration_seconds': data['duration_seconds']
     })
+    response['ETag'] = etag
+    return response
+
+
+@login_required
+def video_stream(request, pk):
+    """
+    Serve a video file without shuffling its bytes through Python.
+
+    Hands the transfer to nginx via X-Accel-Redirect (configure
+    `location /protected/ { internal; alias <MEDIA_ROOT>/; }`), so the
+    request handler returns immediately and the kernel streams the
+    file. Under DEBUG, where there is no nginx in front, FileResponse
+    streams it directly.
+    """
+    video = get_object_or_404(
+        VideoUpload.objects.only('id', 'video_file'), pk=pk
+    )
+    content_type, _ = mimetypes.guess_type(video.video_file.name)
+    content_type = content_type or 'application/octet-stream'
+
+    if settings.DEBUG:
+        try:
+            return FileResponse(
+                video.video_file.open('rb'), content_type=content_type
+            )
+        except FileNotFoundError:
+            raise Http404("Video file not found")
+
+    response = HttpResponse(content_type=content_type)
+    response['X-Accel-Redirect'] = f'/protected/{video.video_file.name}'
+    return response
 
 
 # Legacy views - kept for backward compatibility but deprecated
@@ -213,13 +372,13 @@ def get_processing_status(request, video_id):
 @login_required
 def engagement_create(request):
     """Redirect to video upload since manual entry is no longer supported"""
-    messages.info(request, "Engagement records are now automatically generated from video uploads.")
-    return redirect('engagement:upload_video')
+    # Pure bounce endpoint: carry the notice in the querystring instead
+    # of the messages framework, so no session/cookie write is forced
+    return redirect(reverse('engagement:upload_video') + '?notice=moved')
 
 
 @login_required
 def engagement_update(request, pk):
     """Redirect to list since manual editing is no longer supported"""
-    messages.info(request, "Engagement records are automatically generated and cannot be manually edited.")
-    return redirect('engagement:engagement_list')
+    return redirect(reverse('engagement:engagement_list') + '?notice=moved')
 
@@ -41,5 +41,4 @@ urlpatterns = [
          name='password_reset_complete'),
          # Engagement Record Submission
     path('add-engagement/', views.add_engagement, name='add_engagement'),
-    path('dashboard/', views.dashboard, name='dashboard'),
 ]
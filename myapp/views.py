@@ -3,22 +3,10 @@ from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from .forms import RegisterForm, LoginForm
-from django.contrib.auth.models import User
-from django.shortcuts import render, redirect
-from django.contrib.auth.decorators import login_required
-from .forms import EngagementRecordForm
-
-
-
-def home(request):
-    return render(request, 'home.html')
+from django.db.models import Avg, Count
+from .forms import RegisterForm, LoginForm, EngagementRecordForm
+from .models import EngagementRecord
 
-def about(request):
-    return render(request, 'about.html')
-
-def contact(request):
-    return render(request, 'contact.html')
 
 def register_view(request):
     form = RegisterForm()
@@ -58,13 +46,6 @@ def logout_view(request):
     logout(request)
     return redirect('login')
 
-@login_required
-def dashboard(request):
-    if not request.user.is_superuser:
-        return redirect('userpage')
-    user_count = User.objects.count()
-    return render(request, 'dashboard.html', {'user_count': user_count})
-
 @login_required
 def home(request):
     return render(request, 'home.html')
@@ -91,5 +72,22 @@ def add_engagement(request):
     return render(request, 'add_engagement.html', {'form': form})
 @login_required
 def dashboard(request):
-    records = request.user.engagementrecord_set.all()
-    return render(request, 'dashboard.html', {'records': records})      
\ No newline at end of file
+    total_users = User.objects.count()
+
+    # Summary stats are computed in SQL; only the 20 most recent rows
+    # are shipped to the template
+    user_records = EngagementRecord.objects.filter(student=request.user)
+    stats = user_records.aggregate(
+        avg_score=Avg('attention_score'),
+        record_count=Count('id')
+    )
+    records = user_records.only(
+        'attention_score', 'emotion', 'timestamp'
+    ).order_by('-timestamp')[:20]
+
+    return render(request, 'dashboard.html', {
+        'total_users': total_users,
+        'avg_score': stats['avg_score'],
+        'record_count': stats['record_count'],
+        'records': records
+    })
\ No newline at end of file
@@ -17,9 +17,9 @@ class StudentForm(forms.ModelForm):
             })
         }
 
-    def clean_email(self):
-        email = self.cleaned_data.get('email')
-        if Student.objects.filter(email=email).exclude(pk=self.instance.pk).exists():
-            raise forms.ValidationError("A student with this email already exists.")
-        return email
+    def validate_unique(self):
+        # Email uniqueness is enforced by the DB constraint; the views
+        # catch IntegrityError on save, so skip the pre-save SELECT the
+        # default implementation would issue.
+        pass
 
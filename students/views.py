@@ -1,20 +1,26 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import IntegrityError
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView, DetailView
 from django.urls import reverse_lazy
+from engagement.pagination import paginate_keyset, next_page_url
 from .models import Student
 from .forms import StudentForm
 
 
 @login_required
 def student_list(request):
-    students_list = Student.objects.all()
-    paginator = Paginator(students_list, 10)
-    page_number = request.GET.get('page')
-    students = paginator.get_page(page_number)
-    return render(request, 'students/student_list.html', {'students': students})
+    students, next_cursor = paginate_keyset(
+        Student.objects.all(),
+        before=request.GET.get('before'),
+        limit=10,
+        field='created_at'
+    )
+    return render(request, 'students/student_list.html', {
+        'students': students,
+        'next_page_url': next_page_url(request, next_cursor)
+    })
 
 
 @login_required
@@ -22,9 +28,13 @@ def student_create(request):
     if request.method == 'POST':
         form = StudentForm(request.POST)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Student added successfully!")
-            return redirect('students:student_list')
+            try:
+                form.save()
+            except IntegrityError:
+                form.add_error('email', "A student with this email already exists.")
+            else:
+                messages.success(request, "Student added successfully!")
+                return redirect('students:student_list')
     else:
         form = StudentForm()
     return render(request, 'students/student_form.html', {'form': form, 'action': 'Add'})
@@ -36,9 +46,13 @@ def student_update(request, pk):
     if request.method == 'POST':
         form = StudentForm(request.POST, instance=student)
         if form.is_valid():
-            form.save()
-            messages.success(request, "Student updated successfully!")
-            return redirect('students:student_list')
+            try:
+                form.save()
+            except IntegrityError:
+                form.add_error('email', "A student with this email already exists.")
+            else:
+                messages.success(request, "Student updated successfully!")
+                return redirect('students:student_list')
     else:
         form = StudentForm(instance=student)
     return render(request, 'students/student_form.html', {'form': form, 'action': 'Edit', 'student': student})